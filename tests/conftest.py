@@ -0,0 +1,74 @@
+"""
+Offline translators for the tests
+
+The translators are built with their real constructors, only their network accesses are replaced by stubs
+"""
+
+import pytest
+
+from translatepy.translators import bing, deepl
+
+
+class SessionStub:
+    """
+    Records the POST requests instead of sending them
+    """
+
+    def __init__(self):
+        self.payloads = []
+
+    def post(self, url, data=None, **kwargs):
+        self.payloads.append(data)
+        raise ConnectionError("offline")
+
+
+class JSONRPCStub:
+    """
+    Answers the DeepL JSONRPC requests with a translation from `source_language`
+    """
+
+    def __init__(self, source_language="EN"):
+        self.source_language = source_language
+        self.calls = []
+
+    def send_jsonrpc(self, method, params):
+        self.calls.append((method, params))
+        return {"source_lang": self.source_language, "translations": [{"beams": [{"sentences": [{"text": "translation"}]}]}]}
+
+
+class BingSessionManagerStub:
+    """
+    Answers the Bing requests with a translation from English
+    """
+
+    def __init__(self, request, captcha_callback=None):
+        self.session = request
+        self.calls = []
+
+    def send(self, url, data):
+        self.calls.append((url, data))
+        if url.endswith("/texamplev3"):
+            return [{"examples": []}]
+        if url.endswith("/tspellcheckv3"):
+            return {"correctedText": ""}
+        return [{"detectedLanguage": {"language": "en"}, "translations": [{"text": "translation"}]}]
+
+
+@pytest.fixture
+def offline_jsonrpc(monkeypatch):
+    monkeypatch.setattr(deepl.GetClientState, "get", lambda self: 10000)  # no client state request
+    return deepl.JSONRPCRequest(SessionStub())
+
+
+@pytest.fixture
+def offline_deepl(monkeypatch):
+    monkeypatch.setattr(deepl.GetClientState, "get", lambda self: 10000)
+    translator = deepl.DeeplTranslate(request=SessionStub())
+    translator.jsonrpc = JSONRPCStub()
+    return translator
+
+
+@pytest.fixture
+def offline_bing(monkeypatch):
+    monkeypatch.setattr(bing, "BingSessionManager", BingSessionManagerStub)
+    return bing.BingTranslate(request=SessionStub())
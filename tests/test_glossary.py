@@ -0,0 +1,81 @@
+import pytest
+
+from translatepy.translators.deepl import DeeplTranslate, DeeplTranslateException
+
+
+def _write_glossary(tmp_path, content, encoding="utf-8"):
+    path = tmp_path / "glossary.csv"
+    path.write_text(content, encoding=encoding)
+    return str(path)
+
+
+def test_load_glossary_from_csv(tmp_path, offline_deepl):
+    print("[test] --> Testing DeeplTranslate.load_glossary_from_csv")
+    translator = offline_deepl
+    path = _write_glossary(tmp_path, "en;fr\ncat;chat\ndog;chien\ncat;matou\n")
+    with pytest.warns(UserWarning):
+        glossary = translator.load_glossary_from_csv(path, source_language="en", target_language="fr")
+    assert glossary.source_language == "EN"
+    assert glossary.target_language == "FR"
+    assert glossary.mapping == {"cat": "matou", "dog": "chien"}
+
+
+def test_load_glossary_from_csv_with_bom(tmp_path, offline_deepl):
+    translator = offline_deepl
+    path = _write_glossary(tmp_path, "en;fr\ncat;chat\n", encoding="utf-8-sig")
+    glossary = translator.load_glossary_from_csv(path, source_language="en", target_language="fr")
+    assert glossary.mapping == {"cat": "chat"}
+
+
+def test_load_glossary_from_csv_errors(tmp_path, offline_deepl):
+    translator = offline_deepl
+    path = _write_glossary(tmp_path, "en;fr\ncat;chat\n")
+    with pytest.raises(DeeplTranslateException) as error:
+        translator.load_glossary_from_csv(path, source_language="en", target_language="zh")
+    assert error.value.status_code == 5000
+    with pytest.raises(DeeplTranslateException) as error:
+        translator.load_glossary_from_csv(path, source_language="en", target_language="en")
+    assert error.value.status_code == 5001
+    with pytest.raises(DeeplTranslateException) as error:
+        translator.load_glossary_from_csv(path, source_language="en", target_language="de")
+    assert error.value.status_code == 5010
+    with pytest.raises(DeeplTranslateException) as error:
+        translator.load_glossary_from_csv(path, separator=";;", source_language="en", target_language="fr")
+    assert error.value.status_code == 5012
+
+
+def test_translate_with_glossary(offline_deepl):
+    translator = offline_deepl
+
+    words = ["word{:02}".format(index) for index in range(12)]
+    mapping = {word: "mot{:02}".format(index) for index, word in enumerate(words)}
+    mapping['"quoted"'] = "cité"
+    glossary = DeeplTranslate.FormatedGlossary(dict(sorted(mapping.items())), "EN", "FR")
+
+    with pytest.warns(UserWarning) as record:
+        result = translator.translate(" ".join(words) + ' "quoted"', "fr", "en", glossary=glossary)
+    assert result.result == "translation"
+    messages = [str(warning.message) for warning in record]
+    assert any("quotes" in message for message in messages)
+    assert any("limit of 10" in message for message in messages)
+
+    method, params = translator.jsonrpc.calls[-1]
+    assert method == "LMT_handle_jobs"
+    # the pair with quotes is skipped and only the first 10 terms are sent
+    assert params["commonJobParams"]["termbase"]["dictionary"] == "\n".join(
+        "word{index:02}\tmot{index:02}".format(index=index) for index in range(10))
+
+
+def test_translate_with_glossary_and_auto_detection(offline_deepl):
+    translator = offline_deepl
+    glossary = DeeplTranslate.FormatedGlossary({"cat": "chat"}, "EN", "FR")
+
+    with pytest.raises(DeeplTranslateException) as error:
+        translator.translate("the glossary cat", "fr", glossary=glossary)
+    assert error.value.status_code == 5011
+
+    # the language detected by a previous translation does not change the result
+    translator.translate("the glossary cat", "de")
+    with pytest.raises(DeeplTranslateException) as error:
+        translator.translate("the glossary cat", "fr", glossary=glossary)
+    assert error.value.status_code == 5011
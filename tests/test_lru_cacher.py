@@ -0,0 +1,13 @@
+from translatepy.utils.lru_cacher import LRUDictCache
+
+
+def test_lru_dict_cache():
+    cache = LRUDictCache(2)
+    cache["a"] = 1
+    cache["b"] = 2
+    assert cache.get("a") == 1  # "a" becomes the most recently used key
+    cache["c"] = 3
+    assert "a" in cache
+    assert "b" not in cache
+    assert cache.get("b") is None
+    assert cache.get("b", 0) == 0
@@ -1,5 +1,12 @@
+from threading import Thread
+from time import monotonic, sleep
+
+import pytest
+
 from translatepy.exceptions import UnsupportedMethod
+from translatepy.language import Language
 from translatepy.translators.bing import (BingTranslate, BingTranslateException)
+from translatepy.translators import deepl
 from translatepy.translators.deepl import (DeeplTranslate, DeeplTranslateException)
 from translatepy.translators.google import GoogleTranslateV1, GoogleTranslateV2
 from translatepy.translators.mymemory import (MyMemoryTranslate, MyMemoryException)
@@ -36,6 +43,19 @@ class TestAllTranslators:
                 except IGNORED_EXCEPTIONS:
                     continue
 
+    def test_service_translate_batch(self):
+        translation_args_list = [(["Hello, how are you?", "Good morning", "See you tomorrow"], "ja")]
+
+        for service in self.services_list:
+            assert service.translate_batch([], "ja") == []
+            for texts, destination_language in translation_args_list:
+                try:
+                    results = service.translate_batch(texts, destination_language)
+                    assert len(results) == len(texts)
+                    assert [result.source for result in results] == texts
+                except IGNORED_EXCEPTIONS:
+                    continue
+
     def test_service_transliterate(self):
         transliteration_args_list = [("こんにちは?", "en")]
 
@@ -112,3 +132,84 @@ class TestAllTranslators:
                     assert result
                 except IGNORED_EXCEPTIONS:
                     continue
+
+
+def test_deepl_supported_languages():
+    assert isinstance(DeeplTranslate._supported_languages, frozenset)
+    assert len(DeeplTranslate._supported_languages) == 25
+    assert DeeplTranslate._glossary_supported_languages == {'DE', 'EN', 'ES', 'FR', 'JA', 'IT', 'PL', 'NL'}
+
+
+def test_formality_on_translator_without_formality(offline_bing):
+    translator = offline_bing
+
+    result = translator.translate("Hello formal world", "fr", formality="formal")
+    assert result.result == "translation"
+    assert len(translator.session_manager.calls) == 1
+
+    with pytest.raises(UnsupportedMethod):
+        translator.translate("Hello formal world", "fr", glossary=DeeplTranslate.FormatedGlossary({"world": "monde"}, "EN", "FR"))
+
+
+def test_deepl_detected_languages_cache(offline_deepl):
+    translator = offline_deepl
+
+    def sent_source_language(destination_language):
+        translator.translate("Hello, detected language cache", destination_language)
+        return translator.jsonrpc.calls[-1][1]["lang"]["source_lang_user_selected"]
+
+    assert sent_source_language("fr") == "AUTO"
+    assert sent_source_language("de") == "EN"  # the detected language is reused
+    assert sent_source_language("en") == "AUTO"  # but never as an EN -> EN job
+    assert translator.language("Hello, detected language cache").result.id == Language("en").id
+    assert len(translator.jsonrpc.calls) == 3  # no request for the already detected language
+
+    translator.reset_session_lang()
+    assert sent_source_language("it") == "AUTO"
+
+
+def test_deepl_jsonrpc_method_spacing(offline_jsonrpc, monkeypatch):
+    monkeypatch.setattr(deepl, "RATE_LIMIT_WINDOW", 0)
+    for id_number, spacing in ((9, b'"method" : "'), (10, b'"method": "')):
+        offline_jsonrpc.id_number = id_number
+        with pytest.raises(ConnectionError):
+            offline_jsonrpc.send_jsonrpc("LMT_handle_jobs", {})
+        assert spacing + b'LMT_handle_jobs"' in offline_jsonrpc.session.payloads[-1]
+
+
+def test_deepl_jsonrpc_rate_limit(offline_jsonrpc, monkeypatch):
+    monkeypatch.setattr(deepl, "RATE_LIMIT_WINDOW", 0.3)
+    start = monotonic()
+    send_times = []
+
+    def wait_for_slot():
+        offline_jsonrpc._wait_for_slot()
+        send_times.append(monotonic() - start)
+
+    threads = [Thread(target=wait_for_slot) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    sleep(0.1)
+    # the threads wait for their slot without holding the lock
+    assert offline_jsonrpc._access_lock.acquire(timeout=0.05)
+    offline_jsonrpc._access_lock.release()
+    for thread in threads:
+        thread.join()
+
+    send_times.sort()
+    assert send_times[0] < 0.1
+    for previous, current in zip(send_times, send_times[1:]):
+        assert 0.29 <= current - previous < 0.45
+
+
+def test_bing_shares_detected_languages(offline_bing):
+    translator = offline_bing
+    translator.example("Hello, shared detection", "fr")
+    translator.spellcheck("Hello, shared detection")
+    # translation + example, then only the spellcheck: the language detected by the translation is reused
+    assert [url for url, _ in translator.session_manager.calls] == [
+        "https://www.bing.com/ttranslatev3",
+        "https://www.bing.com/texamplev3",
+        "https://www.bing.com/tspellcheckv3"
+    ]
+    assert translator.session_manager.calls[-1][1]["fromLang"] == "en"
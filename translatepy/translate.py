@@ -104,7 +104,7 @@ class Translate:
         def _translate(translator: BaseTranslator, index: int):
             translator = self._instantiate_translator(translator, self.services, index)
             result = translator.translate(
-                text=text, destination_language=dest_lang, source_language=source_lang, formality=formality, dictionary=dictionary
+                text=text, destination_language=dest_lang, source_language=source_lang, formality=formality, glossary=dictionary
             )
             if result is None:
                 raise NoResult("{service} did not return any value".format(service=translator.__repr__()))
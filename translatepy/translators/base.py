@@ -62,10 +62,15 @@ class BaseTranslator(ABC):
     _text_to_speeches_cache = LRUDictCache(8)
 
     _supported_languages = {}
+    # If the translator supports the formality and/or the glossary parameters (i.e DeepL):
+    # when any of them is set, the concrete `_translate` must accept both of them
+    _supports_formality = False
+    _supports_glossary = False
 
     class FormatedGlossary:
-        def __init__(self, dataframe, source_language, target_language):
-            self.dataframe = dataframe
+        def __init__(self, mapping, source_language, target_language):
+            # source term -> target term
+            self.mapping = mapping
             self.source_language = source_language
             self.target_language = target_language
 
@@ -89,7 +94,12 @@ class BaseTranslator(ABC):
                 - "formal" (corresponds to "more" in official API)
                 - "informal" (corresponds to "less" in official API)
                 - None (corresponds to auto mode in official API, which is the default value)
+                It is ignored by the translators which do not support it (`_supports_formality`).
             glossary : FormatedGlossary
+                Only supported by some translators (`_supports_glossary`, i.e DeepL), the others raise `UnsupportedMethod`.
+
+            Translators supporting the formality or the glossary receive both of them in their `_translate`
+            (set to None and "" when unsupported), the other ones only receive the text and the languages.
 
         Returns:
         --------
@@ -111,18 +121,30 @@ class BaseTranslator(ABC):
 
         self._validate_language_pair(source_code, dest_code)
 
+        if glossary and not self._supports_glossary:
+            raise UnsupportedMethod("{service} does not support glossaries".format(service=self.__repr__()))
+        if not self._supports_formality:
+            # The formality is only a preference, the translators not supporting it just ignore it
+            formality = None
+
         # Build cache key
-        _cache_key = str({"t": text, "d": dest_code, "s": source_code})
+        # The formality changes the translation, so it needs to be part of the key
+        _cache_key = str({"t": text, "d": dest_code, "s": source_code, "f": formality})
 
-        if _cache_key in self._translations_cache:
+        if not glossary and _cache_key in self._translations_cache:
             # Taking the values from the cache
             source_language, translation = self._translations_cache[_cache_key]
         else:
             # Call the private concrete implementation of the Translator to get the translation
-            source_language, translation = self._translate(text, dest_code, source_code, formality, glossary)
+            if self._supports_formality or self._supports_glossary:
+                source_language, translation = self._translate(text, dest_code, source_code, formality, glossary)
+            else:
+                source_language, translation = self._translate(text, dest_code, source_code)
 
             # Cache the translation values to speed up the translation process in the future
-            self._translations_cache[_cache_key] = (source_language, translation)
+            # (translations made with a glossary depend on its content and are not cached)
+            if not glossary:
+                self._translations_cache[_cache_key] = (source_language, translation)
 
         # Return a `TranslationResult` object
         return TranslationResult(
@@ -141,6 +163,36 @@ class BaseTranslator(ABC):
         """
         raise UnsupportedMethod()
 
+    def translate_batch(self, texts: List[str], destination_language: str, source_language: str = "auto", threads_limit: int = 16) -> List[TranslationResult]:
+        """
+        Translates a list of texts concurrently, so that the requests overlap instead of waiting for each other
+
+        Parameters:
+        ----------
+            texts : list[str]
+                The texts to be translated.
+            destination_language : str
+                The language the texts need to be translated in.
+            source_language : str, default = "auto"
+                The language of the texts.
+            threads_limit : int, default = 16
+                The maximum number of threads that will be spawned by translate_batch
+
+        Returns:
+        --------
+            list[TranslationResult]:
+                The translation results, in the same order as `texts`.
+
+        """
+        dest_lang = Language(destination_language)
+        source_lang = Language(source_language)
+
+        def _translate(text: str):
+            return self.translate(text, destination_language=dest_lang, source_language=source_lang)
+
+        with ThreadPool(max(min(threads_limit, len(texts)), 1)) as pool:
+            return pool.map(_translate, texts)
+
     def translate_html(self, html: Union[str, PageElement, Tag, BeautifulSoup], destination_language: str, source_language: str = "auto", parser: str = "html.parser", threads_limit: int = 100) -> Union[str, PageElement, Tag, BeautifulSoup]:
         """
         Translates the given HTML string or BeautifulSoup object to the given language
@@ -6,6 +6,10 @@ import json
 import os
 import re
 import time
+from urllib.parse import urlencode
+from requests import RequestException
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from safeIO import JSONFile
 
 from translatepy.exceptions import UnsupportedMethod
@@ -13,9 +17,17 @@ from translatepy.language import Language
 from translatepy.translators.base import BaseTranslateException, BaseTranslator
 from translatepy.utils.request import Request
 from translatepy.utils.annotations import Callable, Dict
+from translatepy.utils.lru_cacher import LRUDictCache
 
 HOME_DIR = os.path.abspath(os.path.dirname(__file__))
 
+# Retry the requests failing because of a transient network or server error, with an exponential backoff
+# (the translation POST requests can safely be sent again, and 429 is handled by BingSessionManager.send)
+RETRY_STRATEGY = Retry(total=3, backoff_factor=0.1, status_forcelist=(500, 502, 503, 504), allowed_methods=False, raise_on_status=False)
+
+# requests only sets this header itself when given a dict as the body
+FORM_HEADERS = {"Content-Type": "application/x-www-form-urlencoded"}
+
 
 class BingTranslateException(BaseTranslateException):
     error_codes = {
@@ -24,37 +36,37 @@ class BingTranslateException(BaseTranslateException):
 
 
 class BingExampleResult():
+    __slots__ = ("source", "destination")
 
     class SourceExample():
         """The source for an example"""
+        __slots__ = ("prefix", "term", "suffix", "example")
 
         def __init__(self, data) -> None:
-            self._data = data
-            self.prefix = self._data.get("sourcePrefix", "")
-            self.term = self._data.get("sourceTerm", "")
-            self.suffix = self._data.get("sourceSuffix", "")
-            self.example = self.prefix + self.term + self.suffix
+            self.prefix = data.get("sourcePrefix", "")
+            self.term = data.get("sourceTerm", "")
+            self.suffix = data.get("sourceSuffix", "")
+            self.example = "".join((self.prefix, self.term, self.suffix))
 
         def __repr__(self) -> str:
             return str(self.example)
 
     class DestinationExample():
         """The target language example"""
+        __slots__ = ("prefix", "term", "suffix", "example")
 
         def __init__(self, data) -> None:
-            self._data = data
-            self.prefix = self._data.get("targetPrefix", "")
-            self.term = self._data.get("targetTerm", "")
-            self.suffix = self._data.get("targetSuffix", "")
-            self.example = self.prefix + self.term + self.suffix
+            self.prefix = data.get("targetPrefix", "")
+            self.term = data.get("targetTerm", "")
+            self.suffix = data.get("targetSuffix", "")
+            self.example = "".join((self.prefix, self.term, self.suffix))
 
         def __repr__(self) -> str:
             return str(self.example)
 
     def __init__(self, data) -> None:
-        self._data = data
-        self.source = self.SourceExample(self._data)
-        self.destination = self.DestinationExample(self._data)
+        self.source = self.SourceExample(data)
+        self.destination = self.DestinationExample(data)
 
     def __repr__(self) -> str:
         return str(self.source)
@@ -63,6 +75,9 @@ class BingExampleResult():
 class BingSessionManager():
     def __init__(self, request: Request, captcha_callback: Callable[[str], str] = None):
         self.session = request
+        # Keep a dedicated pool of warm keep-alive connections to Bing, so that chained calls
+        # (translate -> example -> spellcheck) and concurrent ones (translate_html) reuse the same TLS sessions
+        self.session.session.mount("https://www.bing.com", HTTPAdapter(pool_connections=4, pool_maxsize=16, max_retries=RETRY_STRATEGY))
         self._auth_session_file = JSONFile(os.path.join(HOME_DIR, ".bing_translatepy"), blocking=False)
         with self._auth_session_file as _auth_session:
             _auth_session_data = _auth_session.read()
@@ -70,6 +85,8 @@ class BingSessionManager():
         self.captcha_callback = captcha_callback
         if not _auth_session_data:
             self._parse_authorization_data()
+        else:
+            self._encode_authorization_data()
 
     def _parse_authorization_data(self):
         for _ in range(3):
@@ -86,24 +103,36 @@ class BingSessionManager():
         else:
             raise BingTranslateException(message="Can't parse the authorization data, try again later or use MicrosoftTranslate")
 
-        _normalized_key = json.loads(_parsed_helper_info[0])[0]
-        _normalized_token = json.loads(_parsed_helper_info[0])[1]
+        _normalized_key, _normalized_token = json.loads(_parsed_helper_info[0])[:2]
 
         self.ig = _parsed_IG[0]
         self.iid = _parsed_IID[0]
         self.key = _normalized_key
         self.token = _normalized_token
         self.cookies = _request.cookies
+        self._encode_authorization_data()
+
+    def _encode_authorization_data(self):
+        """
+        URL-encodes the authorization parameters once, instead of on every request
+        """
+        def _encode(values: dict) -> str:
+            return urlencode({key: value for key, value in values.items() if value is not None})
+
+        self._encoded_params = _encode({'IG': self.ig, 'IID': self.iid, "isVertical": 1})
+        self._encoded_data = _encode({'token': self.token, 'key': self.key, "isAuthv2": True})
 
     def send(self, url, data):
         # Try 2 times to make a request
         for _ in range(2):
-            _params = {'IG': self.ig, 'IID': self.iid, "isVertical": 1}
-            _data = {'token': self.token, 'key': self.key, "isAuthv2": True}
-            _data.update(data)
+            # Only the request specific data needs to be encoded
+            _body = (self._encoded_data + "&" + urlencode(data)).encode("ascii")
 
-            request = self.session.post(url, params=_params, data=_data, cookies=self.cookies)
-            response = request.json()
+            request = self.session.post(url + "?" + self._encoded_params, data=_body, headers=FORM_HEADERS, cookies=self.cookies)
+            try:
+                response = request.json()
+            except ValueError:  # i.e an HTML error or captcha page
+                raise BingTranslateException(request.status_code, "Bing Translate didn't return a valid JSON response")
 
             # Sometimes the Bing Translate API returns the response status code 200 along with the request, even if there is some kind of error.
             # It returns the error itself in the body of the request itself as "statusCode", lol.
@@ -123,7 +152,7 @@ class BingSessionManager():
             elif status_code == 400:
                 try:
                     self._parse_authorization_data()
-                except Exception:
+                except (BingTranslateException, RequestException, ValueError, IndexError):
                     raise BingTranslateException(status_code)
                 else:
                     continue
@@ -156,22 +185,28 @@ class BingTranslate(BaseTranslator):
     def __init__(self, request: Request = Request()):
         self.session_manager = BingSessionManager(request)
         self.session = request
+        # The languages detected by Bing, shared between the chained calls (i.e spellcheck or dictionary after a translation)
+        self._detected_languages = LRUDictCache(512)
 
     def _translate(self, text: str, destination_language: str, source_language: str) -> str:
         response = self.session_manager.send("https://www.bing.com/ttranslatev3", data={'text': text, 'fromLang': source_language, 'to': destination_language})
         try:
             _detected_language = response[0]["detectedLanguage"]["language"]
-        except Exception:
+        except (KeyError, IndexError, TypeError):  # no language detection when the source language is given
             _detected_language = source_language
+        else:
+            if source_language == "auto-detect":
+                self._detected_languages[text] = _detected_language
         return _detected_language, response[0]["translations"][0]["text"]
 
     def _example(self, text, destination_language, source_language) -> str:
         if source_language == "auto-detect":
-            source_language = self._language(text)
+            source_language = self._detected_languages.get(text, source_language)
 
+        # The translation also gives back the detected language, no need to detect it beforehand
         _detected_language, translation = self._translate(text, destination_language, source_language)
 
-        response = self.session_manager.send("https://www.bing.com/texamplev3", data={'text': text.lower(), 'from': source_language, 'to': destination_language, 'translation': translation.lower()})
+        response = self.session_manager.send("https://www.bing.com/texamplev3", data={'text': text.lower(), 'from': _detected_language, 'to': destination_language, 'translation': translation.lower()})
         return _detected_language, [BingExampleResult(example) for example in response[0]["examples"]]
 
     def _spellcheck(self, text: str, source_language: str) -> str:
@@ -185,18 +220,23 @@ class BingTranslate(BaseTranslator):
         return source_language, result
 
     def _language(self, text: str) -> str:
+        _detected_language = self._detected_languages.get(text)
+        if _detected_language is not None:
+            return _detected_language
         response = self.session_manager.send("https://www.bing.com/ttranslatev3", data={'text': text, 'fromLang': "auto-detect", 'to': "en"})
-        return response[0]["detectedLanguage"]["language"]
+        _detected_language = response[0]["detectedLanguage"]["language"]
+        self._detected_languages[text] = _detected_language
+        return _detected_language
 
     def _transliterate(self, text: str, destination_language: str, source_language: str):
         response = self.session_manager.send("https://www.bing.com/ttranslatev3", data={'text': text, 'fromLang': source_language, 'to': destination_language})
         # XXX: Not a predictable response from Bing Translate
         try:
             return source_language, response[1]["inputTransliteration"]
-        except IndexError:
+        except (KeyError, IndexError):
             try:
                 return source_language, response[0]["translations"][0]["transliteration"]["text"]
-            except Exception:
+            except (KeyError, IndexError, TypeError):
                 return source_language, text
 
     def _dictionary(self, text: str, destination_language: str, source_language: str):
@@ -9,19 +9,68 @@ About the translation and the language endpoints:
 © Anime no Sekai — 2022
 """
 
-from time import time, sleep
+import csv
+from codecs import lookup
+from collections import deque
+from threading import Lock
+from time import monotonic, time, sleep
+from types import MappingProxyType
 from re import compile
 from random import randint
-from bs4 import BeautifulSoup
-import pandas as pd
+from bs4 import BeautifulSoup, SoupStrainer
 import warnings
 from translatepy.language import Language
 from translatepy.translators.base import BaseTranslator, BaseTranslateException
 from translatepy.utils.annotations import Tuple, List
+from translatepy.utils.lru_cacher import LRUDictCache
 from translatepy.utils.request import Request
 
+try:
+    from orjson import dumps as json_dumps  # optional, faster JSON serializer (its output is already compact UTF-8 bytes)
+except ImportError:
+    from json import dumps
+
+    def json_dumps(obj) -> bytes:
+        return dumps(obj, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
 
 SENTENCES_SPLITTING_REGEX = compile('(?<=[.!:?]) +')
+LINKS_STRAINER = SoupStrainer("a")
+
+# requests only sets this header itself when given the `json` parameter
+JSON_HEADERS = {"Content-Type": "application/json"}
+
+# Static parts of the LMT_handle_jobs parameters, built once and unpacked in each request
+# (their nested values are shared between the requests: they must never be modified)
+LANG_PARAMS_TEMPLATE = MappingProxyType({
+    "preference": {
+        "weight": {},
+        "default": "default"
+    }
+})
+COMMON_JOB_PARAMS_TEMPLATE = MappingProxyType({
+    "browserType": 1,
+    "mode": "translate"
+})
+
+# Glossary language combinations available on DeepL: source language -> (error code if unavailable, target languages)
+_GLOSSARY_COMBINATIONS = {
+    "EN": (5002, ("FR", "DE", "ES", "IT", "PL", "JA", "NL")),
+    "FR": (5003, ("EN", "DE", "ES", "IT", "PL", "JA", "NL")),
+    "DE": (5004, ("EN", "FR", "ES", "IT", "PL", "JA", "NL")),
+    "ES": (5005, ("EN", "FR", "DE", "IT", "PL", "JA", "NL")),
+    "IT": (5006, ("EN", "FR", "DE", "ES", "PL", "JA", "NL")),
+    "PL": (5007, ("EN", "FR", "DE", "ES", "IT", "JA", "NL")),
+    "JA": (5008, ("EN", "FR", "DE", "ES", "IT", "PL", "NL")),
+    "NL": (5009, ("EN", "FR", "DE", "ES", "IT", "PL", "JA")),
+}
+GLOSSARY_LANGUAGE_PAIRS = frozenset((source, target) for source, (_, targets) in _GLOSSARY_COMBINATIONS.items() for target in targets)
+GLOSSARY_PAIR_ERROR_CODES = {source: error_code for source, (error_code, _) in _GLOSSARY_COMBINATIONS.items()}
+
+# DeepL blocks the IP address when receiving too many requests:
+# at most RATE_LIMIT JSONRPC requests are sent every RATE_LIMIT_WINDOW seconds
+RATE_LIMIT = 1
+RATE_LIMIT_WINDOW = 5
 
 
 class DeeplTranslateException(BaseTranslateException):
@@ -46,6 +95,7 @@ class DeeplTranslateException(BaseTranslateException):
         5009: "Invalid CSV file: NL can only be combined with EN, FR, DE, ES, IT, PL, JA.",
         5010: "Invalid CSV file: Error in the header (or in its declaration in the 'load_glossary_from_csv' function)",
         5011: "Syntax Error: The combination in the glossary does not correspond to the combination declared in the translate function.",
+        5012: "Invalid separator: The CSV separator must be a single character.",
     }
 
 
@@ -91,7 +141,8 @@ class JSONRPCRequest:
         except Exception:
             self.id_number = (randint(1000, 9999) * 10000) + 1  # ? I didn't verify the range, but it's better having only DeepL not working than having Translator() crash for only one service
         self.session = request
-        self.last_access = 0
+        self._access_times = deque(maxlen=RATE_LIMIT)
+        self._access_lock = Lock()
 
     def dump(self, method, params):
         self.id_number += 1
@@ -102,14 +153,37 @@ class JSONRPCRequest:
             "id": self.id_number,
         }
 
+    def _wait_for_slot(self):
+        """
+        Waits until a request can be sent without exceeding DeepL's rate limit.
+
+        The sending slot is reserved while holding the lock, but the waiting happens outside of it,
+        so that concurrent threads only wait for their own slot instead of queuing behind each other.
+        """
+        with self._access_lock:
+            now = monotonic()
+            if len(self._access_times) == RATE_LIMIT:
+                slot = max(now, self._access_times[0] + RATE_LIMIT_WINDOW)
+            else:
+                slot = now
+            self._access_times.append(slot)
+        sleep(max(slot - now, 0))
+
     def send_jsonrpc(self, method, params):
-        # Take a break 5 sec between requests, so as not to get a block by the IP address
-        if time() - self.last_access < 5:
-            distance = 5 - (time() - self.last_access)
-            sleep(max(distance, 0))
+        # Take a break between requests, so as not to get a block by the IP address
+        self._wait_for_slot()
+
+        # Serialized once, compactly and without escaping the non-ASCII characters, to keep the payload small
+        data = self.dump(method, params)
+        payload = json_dumps(data)
+        # DeepL fingerprints the spacing after the "method" key (which its web client chooses from the request ID)
+        # and answers the requests without it as bot traffic: it needs to be put back in the compact payload
+        if (data["id"] + 5) % 29 == 0 or (data["id"] + 3) % 13 == 0:
+            payload = payload.replace(b'"method":"', b'"method" : "', 1)
+        else:
+            payload = payload.replace(b'"method":"', b'"method": "', 1)
 
-        request = self.session.post("https://www2.deepl.com/jsonrpc", json=self.dump(method, params))
-        self.last_access = time()
+        request = self.session.post("https://www2.deepl.com/jsonrpc", data=payload, headers=JSON_HEADERS)
         response = request.json()
         if request.status_code == 200:
             return response["result"]
@@ -118,25 +192,53 @@ class JSONRPCRequest:
 
 
 class DeeplTranslate(BaseTranslator):
-    _supported_languages = {'AUTO', 'BG', 'ZH', 'CS', 'DA', 'NL', 'NL', 'EN', 'ET', 'FI', 'FR', 'DE', 'EL', 'HU', 'IT', 'JA', 'LV', 'LT', 'PL', 'PT', 'RO', 'RO', 'RO', 'RU', 'SK', 'SL', 'ES', 'ES', 'SV'}
-    _glossary_supported_languages = {'DE', 'EN', 'ES', 'FR', 'JA', 'IT', 'PL', 'NL'}
+    _supported_languages = frozenset({'AUTO', 'BG', 'ZH', 'CS', 'DA', 'NL', 'EN', 'ET', 'FI', 'FR', 'DE', 'EL', 'HU', 'IT', 'JA', 'LV', 'LT', 'PL', 'PT', 'RO', 'RU', 'SK', 'SL', 'ES', 'SV'})
+    _glossary_supported_languages = frozenset(_GLOSSARY_COMBINATIONS)
+    _supports_formality = True
+    _supports_glossary = True
 
-    def __init__(self, request: Request = Request(), preferred_langs: List = ["EN", "FR"]) -> None:
+    def __init__(self, request: Request = Request(), preferred_langs: List = ["EN", "FR"], regex_split: bool = True) -> None:
+        """
+        Parameters:
+        ----------
+            request : Request
+                The Request class used to make requests
+            preferred_langs : list
+                The languages sent to DeepL as the user's preferred languages
+            regex_split : bool, default = True
+                Split the texts into sentences locally with a regex instead of asking DeepL,
+                which saves a request (and its rate limiting delay) per translation
+        """
         self.session = request
         self.jsonrpc = JSONRPCRequest(request)
         self.user_preferred_langs = preferred_langs
+        self.regex_split = bool(regex_split)
+        # The languages detected by DeepL for each text (keyed by its first 256 characters)
+        self._detected_languages = LRUDictCache(512)
+
+    def reset_session_lang(self) -> None:
+        """
+        Forgets the languages previously detected by DeepL for the texts already translated
+        """
+        self._detected_languages.clear()
+
+    @staticmethod
+    def _detected_language_key(text: str) -> str:
+        """
+        The texts are identified by their first 256 characters: only the same text
+        (or a long one starting the same way) reuses a detected language
+        """
+        return text.strip()[:256]
 
     def _split_into_sentences(self, text: str, destination_language: str, source_language: str) -> Tuple[List[str], str]:
         """
         Split a string into sentences using the DeepL API.\n
-        Fallbacks to a simple Regex splitting if an error occurs or no result is found
+        Uses a simple Regex splitting instead if `regex_split` is enabled
 
         Returned tuple: (Result, Computed Language (None if same as source_language))
         """
-        REGEX_SPLIT = True
-
-        if REGEX_SPLIT:
-            SENTENCES_SPLITTING_REGEX.split(text), None
+        if self.regex_split:
+            return SENTENCES_SPLITTING_REGEX.split(text.strip()), None
 
         params = {
             "texts": [text.strip()],  # What for need strip there?
@@ -158,6 +260,7 @@ class DeeplTranslate(BaseTranslator):
             - Source Text column
             - Target Text column
             - Header row with the languages (ISO 639-1)
+        The separator must be a single character.
         If you use the glossary with Polish or Japanese:
         Make sure you have an encoding compatible with these languages (UTF-8 is strongly recommended)
         """
@@ -169,59 +272,65 @@ class DeeplTranslate(BaseTranslator):
             raise DeeplTranslateException(5000)
         if source_language == target_language:
             raise DeeplTranslateException(5001)
-        csv = pd.read_csv(file_path, sep=separator, encoding=encoding)
         # check if combinations of source and target language are available by DeepL
-        if source_language == "EN" and target_language not in ["FR", "DE", "ES", "IT", "PL", "JA", "NL"]:
-            raise DeeplTranslateException(5002)
-        if source_language == "FR" and target_language not in ["EN", "DE", "ES", "IT", "PL", "JA", "NL"]:
-            raise DeeplTranslateException(5003)
-        if source_language == "DE" and target_language not in ["EN", "FR", "ES", "IT", "PL", "JA", "NL"]:
-            raise DeeplTranslateException(5004)
-        if source_language == "ES" and target_language not in ["EN", "FR", "DE", "IT", "PL", "JA", "NL"]:
-            raise DeeplTranslateException(5005)
-        if source_language == "IT" and target_language not in ["EN", "FR", "DE", "ES", "PL", "JA", "NL"]:
-            raise DeeplTranslateException(5006)
-        if source_language == "PL" and target_language not in ["EN", "FR", "DE", "ES", "IT", "JA", "NL"]:
-            raise DeeplTranslateException(5007)
-        if source_language == "JA" and target_language not in ["EN", "FR", "DE", "ES", "IT", "PL", "NL"]:
-            raise DeeplTranslateException(5008)
-        if source_language == "NL" and target_language not in ["EN", "FR", "DE", "ES", "IT", "PL", "JA"]:
-            raise DeeplTranslateException(5009)
-        csv.columns = csv.columns.str.upper()
-        try:
-            csv.sort_values(by=[source_language], axis=0, ascending=True, inplace=True, na_position='first')
-            if not csv[source_language].is_unique:
-                warnings.warn(
-                    'Duplicate entries in the dictionary, only the last one will be kept. Please check the dictionary.')
-                csv.drop_duplicates(subset=[source_language], keep='last', inplace=True)
-        except KeyError:
-            raise DeeplTranslateException(5010)
-        return BaseTranslator.FormatedGlossary(csv, source_language, target_language)
+        if (source_language, target_language) not in GLOSSARY_LANGUAGE_PAIRS:
+            raise DeeplTranslateException(GLOSSARY_PAIR_ERROR_CODES[source_language])
+        if len(separator) != 1:
+            raise DeeplTranslateException(5012)
+        # skip the BOM added by some editors (i.e Excel's "CSV UTF-8") at the beginning of the file
+        if lookup(encoding).name == "utf-8":
+            encoding = "utf-8-sig"
+        with open(file_path, encoding=encoding, newline="") as csv_file:
+            reader = csv.DictReader(csv_file, delimiter=separator)
+            if reader.fieldnames is None:
+                raise DeeplTranslateException(5010)
+            reader.fieldnames = [column.upper() for column in reader.fieldnames]
+            if source_language not in reader.fieldnames or target_language not in reader.fieldnames:
+                raise DeeplTranslateException(5010)
+            mapping = {}
+            for row in reader:
+                source_term, target_term = row[source_language], row[target_language]
+                if not source_term or not target_term:
+                    continue
+                if source_term in mapping:
+                    warnings.warn(
+                        'Duplicate entries in the dictionary, only the last one will be kept. Please check the dictionary.')
+                mapping[source_term] = target_term
+        # the terms are sorted, as the first ones are used when the text contains more than 10 of them
+        return BaseTranslator.FormatedGlossary(dict(sorted(mapping.items())), source_language, target_language)
 
     def _translate(self, text: str, destination_language: str, source_language: str, formality: str = None,
-                   dictionary: BaseTranslator.FormatedGlossary = None) -> str:
+                   dictionary: BaseTranslator.FormatedGlossary = "") -> str:
+        auto_detect = source_language == "AUTO"
+        if auto_detect and not dictionary:
+            # reuse the language already detected for this text, if any
+            # (unless it is the destination language: DeepL would then get a X -> X job instead of detecting the language)
+            # a glossary always needs the source language given by the caller, whatever was detected before
+            _cached_language = self._detected_languages.get(self._detected_language_key(text))
+            if _cached_language is not None and _cached_language != destination_language:
+                source_language = _cached_language
         # check if glossary conbination are same as source and target language
         formated_string = ""
         priority = 1
         quality = ""
-        if dictionary != "":
+        if dictionary:
             if source_language.upper() not in dictionary.source_language or destination_language.upper() not in dictionary.target_language:
                 raise DeeplTranslateException(5011)
             limit = 10
             # check if word in the first column in disctionnary is in the text to translate
-            for word in dictionary.dataframe[source_language.upper()]:
-                if word in text and limit > 0:
-                    index = dictionary.dataframe[source_language.upper()].loc[lambda x: x == word].index
-                    target_word = dictionary.dataframe[dictionary.target_language.upper()][index]
-                    if '"' not in target_word.values[0] and '"' not in word:
-                        limit -= 1
-                        formated_string += word + "\t" + target_word.values[0] + "\n"
-                    else:
-                        # warning for words with quotes
-                        warnings.warn('Word with quotes in the dictionary: the pair will be ignored')
-                if word in text and limit == 0:
+            for word, target_word in dictionary.mapping.items():
+                if word not in text:
+                    continue
+                if limit == 0:
                     warnings.warn(
                         'The limit of 10 combinations per query has been reached, the rest of the combinations will be ignored')
+                    break
+                if '"' not in target_word and '"' not in word:
+                    limit -= 1
+                    formated_string += word + "\t" + target_word + "\n"
+                else:
+                    # warning for words with quotes
+                    warnings.warn('Word with quotes in the dictionary: the pair will be ignored')
             if formated_string != "":
                 formated_string = formated_string.replace('"\t"\n', '')
                 if formated_string[-1] == '\n':
@@ -231,26 +340,21 @@ class DeeplTranslate(BaseTranslator):
         sentences, computed_lang = self._split_into_sentences(text, destination_language, source_language)
 
         # building the a job per sentence
-        jobs = self._build_jobs(sentences, quality)
+        jobs, i_count = self._build_jobs(sentences, quality)
 
-        i_count = 1 + sum(sentence.count("i") for sentence in sentences)
         ts = int(time() * 10) * 100 + 1000
         # params building
         params = {
             "jobs": jobs,
             "lang": {
-                "preference": {
-                    "weight": {},
-                    "default": "default"
-                },
+                **LANG_PARAMS_TEMPLATE,
                 "source_lang_computed": source_language,
                 "target_lang": destination_language,
             },
             "priority": priority,
             "commonJobParams": {
-                "browserType": 1,
+                **COMMON_JOB_PARAMS_TEMPLATE,
                 "formality": formality,
-                "mode": "translate",
                 "termbase": {"dictionary": formated_string}
             },
             "timestamp": ts + (i_count - ts % i_count)
@@ -269,11 +373,19 @@ class DeeplTranslate(BaseTranslator):
         except:
             _detected_language = source_language
 
+        if auto_detect and _detected_language != "AUTO":
+            self._detected_languages[self._detected_language_key(text)] = _detected_language
+
         if results is not None:
             translations = results["translations"]
             return _detected_language, " ".join(obj["beams"][0]["sentences"][0]["text"] for obj in translations if obj["beams"][0]["sentences"][0]["text"])
 
     def _language(self, text: str) -> str:
+        _cache_key = self._detected_language_key(text)
+        _cached_language = self._detected_languages.get(_cache_key)
+        if _cached_language is not None:
+            return _cached_language
+
         priority = 1
         quality = ""
 
@@ -281,16 +393,15 @@ class DeeplTranslate(BaseTranslator):
         sentences, computed_lang = self._split_into_sentences(text, "EN", "AUTO")
 
         # building the a job per sentence
-        jobs = self._build_jobs(sentences, quality)
+        jobs, i_count = self._build_jobs(sentences, quality)
 
-        i_count = 1 + sum(sentence.count("i") for sentence in sentences)
         ts = int(time() * 10) * 100 + 1000
 
         # params building
         params = {
             "jobs": jobs,
             "lang": {
-                "preference": {"weight": {}, "default": "default"},
+                **LANG_PARAMS_TEMPLATE,
                 "target_lang": "FR",
                 "user_preferred_langs": ["FR"]
             },
@@ -307,6 +418,7 @@ class DeeplTranslate(BaseTranslator):
         results = self.jsonrpc.send_jsonrpc("LMT_handle_jobs", params)
 
         if results is not None:
+            self._detected_languages[_cache_key] = results["source_lang"]
             return results["source_lang"]
 
     def _dictionary(self, text: str, destination_language: str, source_language: str) -> str:
@@ -318,37 +430,31 @@ class DeeplTranslate(BaseTranslator):
 
         request = self.session.post("https://dict.deepl.com/" + source_language + "-" + destination_language + "/search?ajax=1&source=" + source_language + "&onlyDictEntries=1&translator=dnsof7h3k2lgh3gda&delay=800&jsStatus=0&kind=full&eventkind=keyup&forleftside=true", data={"query": text})
         if request.status_code < 400:
-            response = BeautifulSoup(request.text, "html.parser")
-            _result = [
-                element.text.replace("\n", "")
-                for element in response.find_all("a")
-                if element.has_attr('class') and "dictLink" in element["class"]
-            ]
+            # only the links are parsed, instead of building the whole document tree
+            response = BeautifulSoup(request.text, "html.parser", parse_only=LINKS_STRAINER)
+            _result = [element.text.replace("\n", "") for element in response.find_all("a", class_="dictLink")]
             return source_language, _result
 
     def _build_jobs(self, sentences, quality=""):
         """
         Builds a job for each sentence for DeepL
+
+        Returned tuple: (Jobs, 1 + the number of "i" in the sentences, used to compute the request timestamp)
         """
         jobs = []
+        i_count = 1
+        # the "before" context cannot be more than 5 sentences long i guess?
+        before = deque(maxlen=5)
+        last_index = len(sentences) - 1
         for index, sentence in enumerate(sentences):
-            if index == 0:
-                try:
-                    before = []
-                    after = [sentences[index + 1]]
-                except IndexError:  # index == len(sentences) - 1
-                    before = []
-                    after = []
-            else:
-                if len(before) > 4:
-                    before.pop(0)  # the "before" array cannot be more than 5 elements long i guess?
-                before.extend([sentences[index - 1]])
-                after = [] if index > len(sentences) - 2 else [sentences[index + 1]]
+            i_count += sentence.count("i")
+            if index > 0:
+                before.append(sentences[index - 1])  # the oldest sentence gets dropped by the deque
             job = {
                 "kind": "default",
                 "preferred_num_beams": 4,
-                "raw_en_context_after": after.copy(),
-                "raw_en_context_before": before.copy(),
+                "raw_en_context_after": [sentences[index + 1]] if index < last_index else [],
+                "raw_en_context_before": list(before),
                 "sentences": [{"text": sentence, "id": 0, "prefix": ""}],
 
             }
@@ -356,7 +462,7 @@ class DeeplTranslate(BaseTranslator):
                 job["quality"] = quality
             jobs.append(job)
 
-        return jobs
+        return jobs, i_count
 
     def _language_normalize(self, language):
         return "ZH" if language.id == "zho" else language.alpha2.upper()
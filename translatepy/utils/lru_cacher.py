@@ -19,6 +19,13 @@ class LRUDictCache(OrderedDict):
         self.move_to_end(key)
         return value
 
+    def get(self, key, default=None):
+        # OrderedDict.get does not go through __getitem__, and would not mark the key as recently used
+        try:
+            return self[key]
+        except KeyError:  # also if the key got evicted by another thread in the meantime
+            return default
+
     def __setitem__(self, key, value):
         if key in self:
             self.move_to_end(key)
@@ -6,9 +6,15 @@ from typing import List, Union
 import pyuseragents
 import requests
 from requests.models import CaseInsensitiveDict
+from requests.utils import DEFAULT_ACCEPT_ENCODING
 from translatepy.exceptions import RequestStatusError
 from translatepy.utils.lru_cacher import LRUDictCache
 
+try:
+    from orjson import loads as fast_loads  # optional, faster JSON parser
+except ImportError:
+    fast_loads = None
+
 
 class Response():
     def __init__(self, request_obj: requests.Response) -> None:
@@ -77,6 +83,12 @@ class Response():
             raise RequestStatusError(self.status_code, "Request Status Code: {code}".format(code=str(self.status_code)))
 
     def json(self, **kwargs):
+        if fast_loads is not None and not kwargs:
+            try:
+                # orjson directly parses the raw bytes, without decoding them first
+                return fast_loads(self.content)
+            except ValueError:  # i.e non UTF-8 content, let the standard parser handle it
+                pass
         return loads(self.text, **kwargs)
 
 
@@ -103,7 +115,8 @@ class Request():
             "User-Agent": pyuseragents.random(),
             "Accept": "*/*",
             "Accept-Language": "en-US,en-GB; q=0.5",
-            "Accept-Encoding": "gzip, deflate",
+            # every encoding requests can decode (i.e brotli, when the "brotli" module is installed)
+            "Accept-Encoding": DEFAULT_ACCEPT_ENCODING,
             # "Content-Type": "application/x-www-form-urlencoded; application/json; charset=UTF-8",
             "Connection": "keep-alive"
         }